@@ -10,6 +10,7 @@
 
 """Webpack bundle API."""
 
+import json
 import re
 from functools import wraps
 
@@ -17,6 +18,11 @@ from importlib_metadata import entry_points
 
 from pywebpack.errors import MergeConflictError
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 # https://semver.org/#is-there-a-suggested-regular-expression-regex-to-check-a-semver-string
 # Differences:
 # - `^\D*`: ignores the first not numberic char (major version), e.g. ~ or <
@@ -47,6 +53,48 @@ def cached(f):
     return inner
 
 
+def read_json(path):
+    """Read and parse a JSON file.
+
+    Uses ``orjson`` if it is installed, otherwise the standard library.
+    """
+    with open(path, "rb") as fp:
+        content = fp.read()
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def write_json(path, data):
+    """Write data as indented JSON with sorted keys to a file.
+
+    Uses ``orjson`` if it is installed, otherwise the standard library. Both
+    write UTF-8 without escaping non-ASCII characters and convert non-string
+    dictionary keys to strings. Data that ``orjson`` cannot encode, such as
+    integers larger than 64 bits, is written with the standard library.
+    Float formatting may still differ: ``orjson`` writes ``1e20`` and
+    ``null`` for NaN, while the standard library writes ``1e+20`` and
+    ``NaN``.
+    """
+    output = None
+    if orjson is not None:
+        try:
+            output = orjson.dumps(
+                data,
+                option=(
+                    orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+                ),
+            )
+        except TypeError:
+            # orjson.JSONEncodeError is a subclass of TypeError.
+            pass
+    if output is None:
+        output = json.dumps(data, indent=2, sort_keys=True, ensure_ascii=False)
+        output = output.encode("utf-8")
+    with open(path, "wb") as fp:
+        fp.write(output)
+
+
 def check_exit(f):
     """Decorator to ensure that an NPM process exited successfully."""
 
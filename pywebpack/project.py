@@ -10,18 +10,30 @@
 
 """API for creating and building Webpack projects."""
 
-import json
 import shutil
-from os import makedirs
-from os.path import dirname, exists, join
+import subprocess
+from os import makedirs, remove, stat
+from os.path import dirname, exists, join, lexists, relpath
 
 from pynpm import NPMPackage, YarnPackage
 
 from pywebpack.errors import MergeConflictError
 
-from .helpers import cached, check_exit, merge_deps
+from .helpers import cached, check_exit, merge_deps, read_json, write_json
 from .storage import FileStorage
 
+_ENTRY_DUP_ERR = (
+    "Duplicated bundle entry for `{0}:{1}` in bundle `{2}` and "
+    "`{3}:{4}` in bundle `{5}`. Please choose another entry name."
+)
+_ALIAS_DUP_ERR = (
+    "Duplicated alias for `{0}:{1}` in bundle `{2}` and "
+    "`{3}:{4}` in bundle `{5}`. Please choose another alias name."
+)
+
+# Parsed source package.json files and their modification times, keyed by path.
+_package_json_cache = {}
+
 
 class WebpackProject(object):
     """API for building an existing Webpack project."""
@@ -29,9 +41,11 @@ class WebpackProject(object):
     def __init__(self, path):
         """Initialize instance."""
         self._npmpkg = None
+        self._project_path = None
         self._path = path
 
     @property
+    @cached
     def project_path(self):
         """Get the project path."""
         return dirname(self.npmpkg.package_json_path)
@@ -120,26 +134,71 @@ class WebpackTemplateProject(WebpackProject):
         """Storage class property."""
         return self._storage_cls
 
-    def create(self, force=None, skip=None):
-        """Create webpack project from a template."""
-        self.storage_cls(self._project_template_dir, self.project_path).run(
-            force=force, skip=skip
-        )
+    def create(self, force=None, skip=None, fast=False):
+        """Create webpack project from a template.
+
+        :param force: Relative paths of files to copy even if they are
+            up-to-date.
+        :param skip: Relative paths of files not to copy.
+        :param fast: Copy the whole template with :func:`shutil.copytree`
+            instead of going through the storage class. Files are copied the
+            same way, but without comparing modification times first, so
+            up-to-date files are copied again and ``force`` is ignored. This
+            saves a few stat calls per file for fresh working directories,
+            but makes repeated calls slower. Only applies to
+            :class:`~pywebpack.storage.FileStorage`.
+        """
+        if fast and self.storage_cls is FileStorage:
+            self._copytree(self._project_template_dir, self.project_path, skip=skip)
+        else:
+            self.storage_cls(self._project_template_dir, self.project_path).run(
+                force=force, skip=skip
+            )
 
         # Write config if not empty
         config = self.config
         config_path = self.config_path
         if config:
             # Create config path directory if it does not exists.
-            if not exists(dirname(config_path)):
-                makedirs(dirname(config_path))
+            makedirs(dirname(config_path), exist_ok=True)
             # Write config.json
-            with open(config_path, "w") as fp:
-                json.dump(config, fp, indent=2, sort_keys=True)
+            write_json(config_path, config)
+
+    @staticmethod
+    def _copytree(srcdir, dstdir, skip=None):
+        """Copy all files from a folder, except the skipped relative paths."""
+        skip = skip or []
+
+        def ignore(folder, names):
+            return [n for n in names if relpath(join(folder, n), srcdir) in skip]
+
+        def copy(src, dst):
+            # Replace existing files and symlinks instead of writing through.
+            if lexists(dst):
+                remove(dst)
+            return shutil.copy(src, dst)
+
+        shutil.copytree(
+            srcdir,
+            dstdir,
+            ignore=ignore if skip else None,
+            copy_function=copy,
+            dirs_exist_ok=True,
+        )
+
+    def clean(self, fast_clean=False):
+        """Clean created webpack project.
 
-    def clean(self):
-        """Clean created webpack project."""
-        if exists(self.project_path):
+        :param fast_clean: Remove the project with the native ``rm -rf``
+            command if available, which is considerably faster than
+            :func:`shutil.rmtree` for large ``node_modules`` folders.
+        """
+        if not exists(self.project_path):
+            return
+        rm = shutil.which("rm") if fast_clean else None
+        if rm:
+            subprocess.run([rm, "-rf", "--", self.project_path], check=True)
+        else:
             shutil.rmtree(self.project_path)
 
     def buildall(self):
@@ -198,9 +257,25 @@ class WebpackBundleProject(WebpackTemplateProject):
     @property
     @cached
     def package_json_source(self):
-        """Read original package.json contents."""
-        with open(self.package_json_source_path, "r") as fp:
-            return json.load(fp)
+        """Read original package.json contents.
+
+        The parsed file is shared between projects using the same template,
+        and re-read only if the file was modified in the meantime. Each
+        project gets its own copy of the top-level dictionary and of the
+        dependency maps; other nested values are shared and must not be
+        modified.
+        """
+        path = self.package_json_source_path
+        mtime = stat(path).st_mtime_ns
+        cached_mtime, data = _package_json_cache.get(path, (None, None))
+        if cached_mtime != mtime:
+            data = read_json(path)
+            _package_json_cache[path] = (mtime, data)
+        data = dict(data)
+        for dep_type in ("dependencies", "devDependencies", "peerDependencies"):
+            if dep_type in data:
+                data[dep_type] = dict(data[dep_type])
+        return data
 
     @property
     @cached
@@ -210,64 +285,78 @@ class WebpackBundleProject(WebpackTemplateProject):
 
     @property
     @cached
-    def entry(self):
-        """Get webpack entry points."""
-        entries = dict(entries=dict(), paths=dict())
-        error = (
-            "Duplicated bundle entry for `{0}:{1}` in bundle `{2}` and "
-            "`{3}:{4}` in bundle `{5}`. Please choose another entry name."
-        )
+    def _compiled(self):
+        """Collect entries and aliases of all bundles in a single pass."""
+        entries = {}
+        entry_paths = {}
+        aliases = {}
+        alias_paths = {}
 
         for bundle in self.bundles:
+            bundle_path = bundle.path
             for name, filepath in bundle.entry.items():
                 # check that there are no duplicated entries
-                if name in entries["entries"]:
-                    prev_filepath, prev_bundle_path = entries["paths"][name]
+                prev = entry_paths.get(name)
+                if prev is not None:
+                    prev_filepath, prev_bundle_path = prev
                     raise RuntimeError(
-                        error.format(
+                        _ENTRY_DUP_ERR.format(
                             name,
                             prev_filepath,
                             prev_bundle_path,
                             name,
                             filepath,
-                            bundle.path,
+                            bundle_path,
+                        )
+                    )
+                entry_paths[name] = (filepath, bundle_path)
+                entries[name] = filepath
+
+            for alias, path in bundle.aliases.items():
+                # Check that there are no duplicated aliases
+                prev = alias_paths.get(alias)
+                if prev is not None:
+                    prev_path, prev_bundle_path = prev
+                    raise RuntimeError(
+                        _ALIAS_DUP_ERR.format(
+                            alias, prev_path, prev_bundle_path, alias, path, bundle_path
                         )
                     )
-                entries["paths"][name] = (filepath, bundle.path)
+                alias_paths[alias] = (path, bundle_path)
+                aliases[alias] = path
 
-            entries["entries"].update(bundle.entry)
-        return entries["entries"]
+        return {"entry": entries, "aliases": aliases}
+
+    @property
+    def entry(self):
+        """Get webpack entry points."""
+        return self._compiled["entry"]
 
     @property
     def config(self):
         """Inject webpack entry points from bundles."""
+        # A callable config may return something different on each call.
+        if callable(self._config):
+            return self._merge_config()
+        return self._merged_config
+
+    @property
+    @cached
+    def _merged_config(self):
+        """Cached configuration for a static config dictionary."""
+        return self._merge_config()
+
+    def _merge_config(self):
+        """Merge bundle entry points and aliases into the configuration."""
         config = super(WebpackBundleProject, self).config
-        config.update({"entry": self.entry, "aliases": self.aliases})
+        config["entry"] = self.entry
+        config["aliases"] = self.aliases
         return config
 
     @property
     def aliases(self):
         """Get webpack resolver aliases from bundles."""
-        aliases = dict(aliases=dict(), paths=dict())
-        error = (
-            "Duplicated alias for `{0}:{1}` in bundle `{2}` and "
-            "`{3}:{4}` in bundle `{5}`. Please choose another alias name."
-        )
-
-        for bundle in self.bundles:
-            for alias, path in bundle.aliases.items():
-                # Check that there are no duplicated aliases
-                if alias in aliases["aliases"]:
-                    prev_path, prev_bundle_path = aliases["paths"][alias]
-                    raise RuntimeError(
-                        error.format(
-                            alias, prev_path, prev_bundle_path, alias, path, bundle.path
-                        )
-                    )
-                aliases["paths"][alias] = (path, bundle.path)
-
-            aliases["aliases"].update(bundle.aliases)
-        return aliases["aliases"]
+        return self._compiled["aliases"]
 
     @property
     @cached
@@ -294,10 +383,15 @@ class WebpackBundleProject(WebpackTemplateProject):
 
     def collect(self, force=None):
         """Collect asset files from bundles."""
-        for b in self.bundles:
-            self.storage_cls(b.path, self.project_path).run(force=force)
-
-    def create(self, force=None):
+        if hasattr(self.storage_cls, "run_many"):
+            self.storage_cls.run_many(
+                [b.path for b in self.bundles], self.project_path, force=force
+            )
+        else:
+            for b in self.bundles:
+                self.storage_cls(b.path, self.project_path).run(force=force)
+
+    def create(self, force=None, fast=False):
         """Create webpack project from a template.
 
         This command collects all asset files from the bundles.
@@ -305,12 +399,13 @@ class WebpackBundleProject(WebpackTemplateProject):
         dependencies of each bundle.
         """
         # Skip package.json (because we will always write a new).
-        super(WebpackBundleProject, self).create(force=force, skip=["package.json"])
+        super(WebpackBundleProject, self).create(
+            force=force, skip=["package.json"], fast=fast
+        )
         # Collect all asset files from the bundles.
         self.collect(force=force)
         # Generate new package json (reads the package.json source and merges
         # in npm dependencies).
         package_json = self.package_json
         # Write package.json (with collected dependencies)
-        with open(self.npmpkg.package_json_path, "w") as fp:
-            json.dump(package_json, fp, indent=2, sort_keys=True)
+        write_json(self.npmpkg.package_json_path, package_json)
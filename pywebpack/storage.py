@@ -65,21 +65,37 @@ class FileStorage(object):
             remove(dst)
         copy(src, dst)
 
-    def run(self, force=None, skip=None):
-        """Copy files from source to destination."""
+    def run(self, force=None, skip=None, dstdirs=None):
+        """Copy files from source to destination.
+
+        :param dstdirs: Set of destination folders known to exist. It is
+            updated with the folders created, and can be shared between runs.
+        """
         force = force or {}
         skip = skip or []
+        dstdirs = set() if dstdirs is None else dstdirs
         for fsrc, relpath in self:
             if relpath in skip:
                 continue
             fdst = join(self.dstdir, relpath)
             fdstdir = dirname(fdst)
 
-            if not exists(fdstdir):
-                makedirs(fdstdir)
+            if fdstdir not in dstdirs:
+                makedirs(fdstdir, exist_ok=True)
+                dstdirs.add(fdstdir)
 
             self._copyfile(fsrc, fdst, force=relpath in force)
 
+    @classmethod
+    def run_many(cls, srcdirs, dstdir, force=None, skip=None, **kwargs):
+        """Copy files from several source directories to one destination.
+
+        Destination folders are only created once across all sources.
+        """
+        dstdirs = set()
+        for srcdir in srcdirs:
+            cls(srcdir, dstdir, **kwargs).run(force=force, skip=skip, dstdirs=dstdirs)
+
 
 class LinkStorage(FileStorage):
     """Storage class that link files."""
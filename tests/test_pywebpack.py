@@ -12,18 +12,21 @@
 
 import json
 import os
-from os.path import exists, join
+import shutil
+from os.path import exists, islink, join
 
 import pytest
 
 from pywebpack import (
+    FileStorage,
+    LinkStorage,
     WebpackBundle,
     WebpackBundleProject,
     WebpackProject,
     WebpackTemplateProject,
 )
 from pywebpack.errors import MergeConflictError
-from pywebpack.helpers import max_version, merge_deps
+from pywebpack.helpers import max_version, merge_deps, write_json
 
 
 def json_from_file(filepath):
@@ -137,6 +140,33 @@ def test_merge_deps_incompat_major():
         )
 
 
+def test_write_json(tmpdir, monkeypatch):
+    """Test that JSON output does not depend on orjson being installed."""
+    data = {"entry": {1: "./index.js"}, "name": "caf\u00e9", "b": {"z": 1, "a": 2}}
+    path = join(tmpdir, "out.json")
+
+    write_json(path, data)
+    with open(path, "rb") as fp:
+        output = fp.read()
+
+    monkeypatch.setattr("pywebpack.helpers.orjson", None)
+    write_json(path, data)
+    with open(path, "rb") as fp:
+        assert fp.read() == output
+
+    assert json_from_file(path) == {
+        "b": {"a": 2, "z": 1},
+        "entry": {"1": "./index.js"},
+        "name": "caf\u00e9",
+    }
+    assert "caf\u00e9".encode("utf-8") in output
+
+    # Integers orjson cannot encode are written with the standard library.
+    monkeypatch.undo()
+    write_json(path, {"big": 2**70})
+    assert json_from_file(path) == {"big": 2**70}
+
+
 def test_project(simpleprj):
     """Test extension initialization."""
     project = WebpackProject(simpleprj)
@@ -184,6 +214,34 @@ def test_templateproject_create(templatedir, destdir):
     assert exists(project.npmpkg.package_json_path)
 
 
+def test_templateproject_create_fast(templatedir, destdir):
+    """Test template project creation with a single tree copy."""
+    project = WebpackTemplateProject(destdir, project_template_dir=templatedir)
+    project.create(fast=True, skip=["webpack.config.js"])
+    assert exists(project.npmpkg.package_json_path)
+    assert exists(join(project.project_path, "index.js"))
+    assert not exists(join(project.project_path, "webpack.config.js"))
+
+    # Creating again over an existing project works.
+    project.create(fast=True)
+    assert exists(join(project.project_path, "webpack.config.js"))
+
+
+def test_templateproject_create_fast_over_links(templatedir, destdir):
+    """Test fast creation over a project created with symlinks."""
+    project = WebpackTemplateProject(
+        destdir, project_template_dir=templatedir, storage_cls=LinkStorage
+    )
+    project.create()
+    package_json = project.npmpkg.package_json_path
+    assert islink(package_json)
+
+    project = WebpackTemplateProject(destdir, project_template_dir=templatedir)
+    project.create(fast=True)
+    assert exists(package_json)
+    assert not islink(package_json)
+
+
 def test_templateproject_clean(templatedir, destdir):
     """Test template project creation."""
     project = WebpackTemplateProject(destdir, project_template_dir=templatedir)
@@ -193,6 +251,17 @@ def test_templateproject_clean(templatedir, destdir):
     assert not exists(project.project_path)
 
 
+def test_templateproject_clean_fast(templatedir, destdir):
+    """Test template project cleaning with the native command."""
+    project = WebpackTemplateProject(destdir, project_template_dir=templatedir)
+    project.create()
+    assert exists(project.project_path)
+    project.clean(fast_clean=True)
+    assert not exists(project.project_path)
+    # Cleaning an already clean project is a no-op.
+    project.clean(fast_clean=True)
+
+
 def test_templateproject_create_config(templatedir, destdir):
     """Test template project creation."""
     expected_config = {"entry": "./index.js"}
@@ -305,3 +374,124 @@ def test_bundle_duplicated_entries(builddir, bundledir, bundledir2, destdir):
     )
 
     project.create()
+
+
+def test_bundleproject_independent_errors(builddir, bundledir, bundledir2, destdir):
+    """Test that entry and dependency errors do not affect each other."""
+    project = WebpackBundleProject(
+        working_dir=destdir,
+        project_template_dir=builddir,
+        bundles=[
+            WebpackBundle(bundledir, entry={"app": "./index.js"}),
+            WebpackBundle(bundledir2, entry={"app": "./main.js"}),
+        ],
+    )
+    with pytest.raises(RuntimeError):
+        project.entry
+    assert project.dependencies["dependencies"] == {}
+
+    project = WebpackBundleProject(
+        working_dir=destdir,
+        project_template_dir=builddir,
+        bundles=[
+            WebpackBundle(bundledir, dependencies={"lodash": "~4"}),
+            WebpackBundle(bundledir2, dependencies={"lodash": "~3"}),
+        ],
+    )
+    with pytest.raises(MergeConflictError):
+        project.dependencies
+    assert project.entry == {}
+    assert project.aliases == {}
+
+
+def test_bundleproject_config_cached(builddir, bundledir, destdir):
+    """Test that static configs are merged only once."""
+    bundle = WebpackBundle(bundledir, entry={"app": "./index.js"})
+    project = WebpackBundleProject(
+        working_dir=destdir,
+        project_template_dir=builddir,
+        bundles=[bundle],
+        config={"test": True},
+    )
+    assert project.config is project.config
+
+    project = WebpackBundleProject(
+        working_dir=destdir,
+        project_template_dir=builddir,
+        bundles=[bundle],
+        config=lambda: {"test": True},
+    )
+    assert project.config == {
+        "entry": {"app": "./index.js"},
+        "aliases": {},
+        "test": True,
+    }
+    assert project.config is not project.config
+
+
+def test_bundleproject_package_json_source_cache(
+    builddir, destdir, tmpdir, monkeypatch
+):
+    """Test that the source package.json is shared between projects."""
+    monkeypatch.setattr("pywebpack.project._package_json_cache", {})
+    templatedir = join(tmpdir, "buildtpl")
+    shutil.copytree(builddir, templatedir)
+
+    project1 = WebpackBundleProject(destdir, project_template_dir=templatedir)
+    project2 = WebpackBundleProject(destdir, project_template_dir=templatedir)
+    assert project1.package_json_source == project2.package_json_source
+    assert project1.package_json_source["scripts"] is (
+        project2.package_json_source["scripts"]
+    )
+
+    # Source package.json is re-read once it is modified.
+    st = os.stat(project1.package_json_source_path)
+    os.utime(
+        project1.package_json_source_path,
+        ns=(st.st_atime_ns, st.st_mtime_ns + 1000),
+    )
+    project3 = WebpackBundleProject(destdir, project_template_dir=templatedir)
+    assert project3.package_json_source == project1.package_json_source
+    assert project3.package_json_source["scripts"] is not (
+        project1.package_json_source["scripts"]
+    )
+
+    # Merging bundle dependencies does not modify the other projects' source.
+    bundle = WebpackBundle(destdir, dependencies={"react": "^18"})
+    project4 = WebpackBundleProject(
+        destdir, project_template_dir=templatedir, bundles=[bundle]
+    )
+    assert project4.package_json["dependencies"] == {"react": "^18"}
+    assert "dependencies" not in project3.package_json_source
+
+
+def test_bundleproject_collect_custom_storage(bundledir, bundledir2, builddir, destdir):
+    """Test collecting bundles with custom storage classes."""
+    calls = []
+
+    class SubStorage(FileStorage):
+        def run(self, **kwargs):
+            calls.append(self.srcdir)
+            return super(SubStorage, self).run(**kwargs)
+
+    class DuckStorage(object):
+        def __init__(self, srcdir, dstdir):
+            self.srcdir = srcdir
+
+        def run(self, force=None):
+            calls.append(self.srcdir)
+
+    bundles = [WebpackBundle(bundledir), WebpackBundle(bundledir2)]
+    for storage_cls in (SubStorage, DuckStorage):
+        calls.clear()
+        project = WebpackBundleProject(
+            working_dir=destdir,
+            project_template_dir=builddir,
+            bundles=bundles,
+            storage_cls=storage_cls,
+        )
+        project.collect()
+        assert calls == [bundledir, bundledir2]
+
+    assert exists(join(destdir, "index.js"))
+    assert exists(join(destdir, "main.js"))
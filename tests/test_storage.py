@@ -80,6 +80,18 @@ def test_filestorage(sourcedir, tmpdir):
     assert getmtime(fdst) >= getmtime(fsrc)
 
 
+def test_filestorage_run_many(sourcedir, tmpdir):
+    """Test file storage copy from multiple sources."""
+    FileStorage.run_many(
+        [join(sourcedir, "bundle"), join(sourcedir, "bundle2")], tmpdir
+    )
+    assert exists(join(tmpdir, "index.js"))
+    assert exists(join(tmpdir, "main.js"))
+
+    LinkStorage.run_many([join(sourcedir, "simple")], join(tmpdir, "simple"))
+    assert islink(join(tmpdir, "simple/package.json"))
+
+
 def test_linkstorage(sourcedir, tmpdir):
     """Test file storage copy."""
     fsrc = join(sourcedir, "simple/package.json")